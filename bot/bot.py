@@ -7,7 +7,10 @@ import os
 import sys
 import asyncio
 import logging
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 # Настройка логирования
 logging.basicConfig(
@@ -48,8 +51,15 @@ try:
 except ImportError:
     logger.warning("dotenv не установлен, используем системные переменные")
 
+# uvloop - более быстрый event loop (необязательная зависимость)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+    logger.warning("uvloop не установлен, используем стандартный event loop")
+
 # ========== НАСТРОЙКА DJANGO ==========
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_planner.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_planner.bot_settings')
 
 if DJANGO_AVAILABLE:
     try:
@@ -59,18 +69,20 @@ if DJANGO_AVAILABLE:
         logger.error(f"Ошибка инициализации Django: {e}")
         DJANGO_AVAILABLE = False
 
-# ========== ИМПОРТЫ AIOGRAM И APSCHEDULER ==========
+# ========== ИМПОРТЫ AIOGRAM ==========
 try:
     from aiogram import Bot, Dispatcher, types, F
+    from aiogram.client.default import DefaultBotProperties
+    from aiogram.client.session.aiohttp import AiohttpSession
+    from aiogram.exceptions import TelegramBadRequest
     from aiogram.filters import CommandStart
-    from aiogram.utils.keyboard import ReplyKeyboardMarkup, InlineKeyboardMarkup, InlineKeyboardButton
+    from aiogram.filters.callback_data import CallbackData
+    from aiolimiter import AsyncLimiter
+    from aiogram.utils.keyboard import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
     from aiogram.fsm.state import State, StatesGroup
     from aiogram.fsm.context import FSMContext
-    from asgiref.sync import sync_to_async
-    from apscheduler.schedulers.asyncio import AsyncIOScheduler
-    from apscheduler.triggers.interval import IntervalTrigger
     from django.utils import timezone
-    from django.utils.timezone import localtime
+    from django.conf import settings
     AIOGRAM_AVAILABLE = True
 except ImportError as e:
     logger.error(f"Ошибка импорта зависимостей: {e}")
@@ -87,22 +99,42 @@ if not BOT_TOKEN:
 
 logger.info(f"Чат ID для уведомлений: {YOUR_CHAT_ID}")
 
+# Часовой пояс для отображения сроков (бот работает только в TIME_ZONE проекта)
+LOCAL_TZ = ZoneInfo(settings.TIME_ZONE)
+
 # Создание бота и диспетчера
-bot = Bot(token=BOT_TOKEN)
+# Markdown задаётся один раз для всех сообщений; одна HTTP-сессия с пулом keep-alive соединений
+TELEGRAM_CONNECTION_LIMIT = 200
+# Одновременных запросов меньше, чем соединений в пуле - запрос не ждёт свободного соединения
+TELEGRAM_MAX_IN_FLIGHT = TELEGRAM_CONNECTION_LIMIT * 3 // 4
+bot = Bot(
+    token=BOT_TOKEN,
+    session=AiohttpSession(limit=TELEGRAM_CONNECTION_LIMIT),
+    default=DefaultBotProperties(parse_mode="Markdown"),
+)
 dp = Dispatcher()
 
-# Планировщик задач
-scheduler = AsyncIOScheduler()
+# Запросы к Telegram API ждут свободного места, а не падают по таймауту пула соединений
+outbound_semaphore = asyncio.Semaphore(TELEGRAM_MAX_IN_FLIGHT)
+
+
+@bot.session.middleware
+async def limit_outbound_requests(make_request, request_bot, method):
+    async with outbound_semaphore:
+        return await make_request(request_bot, method)
+
 
 # ========== ПРОВЕРКА БАЗЫ ДАННЫХ ==========
 if DJANGO_AVAILABLE:
+    from asgiref.sync import sync_to_async
+    from django.db import transaction
+    from django.db.models import Min
     from tasks.models import Task
     
-    @sync_to_async
-    def check_database():
+    async def check_database():
         """Проверка соединения с БД"""
         try:
-            count = Task.objects.count()
+            count = await Task.objects.acount()
             logger.info(f"База данных доступна. Задач в БД: {count}")
             return True
         except Exception as e:
@@ -110,107 +142,303 @@ if DJANGO_AVAILABLE:
             return False
     
     # ========== АСИНХРОННЫЕ ФУНКЦИИ ДЛЯ РАБОТЫ С БД ==========
-    @sync_to_async
-    def get_all_tasks():
-        return list(Task.objects.all()[:50])
-    
-    @sync_to_async
-    def get_task_by_id(task_id):
-        try:
-            return Task.objects.get(id=task_id)
-        except Task.DoesNotExist:
-            return None
-    
-    @sync_to_async
-    def delete_task_by_id(task_id):
-        try:
-            Task.objects.get(id=task_id).delete()
-            return True
-        except Task.DoesNotExist:
-            return False
-    
-    @sync_to_async
-    def create_task(title, description, due_date):
-        return Task.objects.create(
+    # Поля, которые бот показывает пользователю
+    TASK_FIELDS = ('id', 'title', 'description', 'due_date', 'status')
+    
+    # Кэш списка задач: сбрасывается при изменениях из бота,
+    # изменения через веб становятся видны не позже чем через TASKS_CACHE_TTL
+    TASKS_CACHE_TTL = 2
+    _tasks_cache = {'version': 0, 'payload': None, 'ts': 0.0}
+    
+    def invalidate_tasks_cache():
+        _tasks_cache['version'] += 1
+        _tasks_cache['payload'] = None
+    
+    def forget_cached_task(task_id):
+        """Убирает удалённую задачу из кэша, не сбрасывая его"""
+        _tasks_cache['version'] += 1
+        if _tasks_cache['payload'] is not None:
+            _tasks_cache['payload'] = [t for t in _tasks_cache['payload'] if t['id'] != task_id]
+    
+    async def get_all_tasks():
+        if _tasks_cache['payload'] is not None and time.monotonic() - _tasks_cache['ts'] < TASKS_CACHE_TTL:
+            return _tasks_cache['payload']
+        
+        version = _tasks_cache['version']
+        tasks = [task async for task in Task.objects.order_by('-created_at').values(*TASK_FIELDS)[:50]]
+        # Не сохраняем результат, если во время запроса список изменился
+        if _tasks_cache['version'] == version:
+            _tasks_cache['payload'] = tasks
+            _tasks_cache['ts'] = time.monotonic()
+        return tasks
+    
+    async def get_task_title(task_id):
+        return await Task.objects.filter(id=task_id).values_list('title', flat=True).afirst()
+    
+    async def delete_task_by_id(task_id):
+        deleted, _ = await Task.objects.filter(id=task_id).adelete()
+        if deleted:
+            forget_cached_task(task_id)
+        return deleted > 0
+    
+    async def create_task(title, description, due_date):
+        task = await Task.objects.acreate(
             title=title,
             description=description,
             due_date=due_date,
             status='new'
         )
-    
-    @sync_to_async
-    def get_pending_tasks_with_deadline():
-        return list(Task.objects.filter(
-            due_date__isnull=False,
+        invalidate_tasks_cache()
+        return task
+    
+    async def get_pending_tasks_due_between(start=None, end=None):
+        """Незавершённые задачи со сроком в интервале (start, end]"""
+        filters = {'status__in': ['new', 'in_progress'], 'due_date__isnull': False}
+        if start is not None:
+            filters['due_date__gt'] = start
+        if end is not None:
+            filters['due_date__lte'] = end
+        return [task async for task in Task.objects.filter(
+            **filters
+        ).order_by('due_date').values(*TASK_FIELDS).aiterator()]
+    
+    async def get_next_deadline(after):
+        """Ближайший срок незавершённой задачи позже after"""
+        result = await Task.objects.filter(
+            due_date__gt=after,
             status__in=['new', 'in_progress']
-        ))
+        ).aaggregate(next_due=Min('due_date'))
+        return result['next_due']
     
     @sync_to_async
-    def mark_task_overdue(task_id):
-        try:
-            task = Task.objects.get(id=task_id)
-            task.status = 'overdue'
-            task.save()
-            return True
-        except Task.DoesNotExist:
-            return False
+    def flip_overdue_and_return(now, limit, exclude_ids=()):
+        """
+        Помечает до limit просроченных задач как 'overdue' и возвращает их строки.
+        Выборка и UPDATE выполняются в одной транзакции, уже захваченные
+        другим процессом строки пропускаются.
+        """
+        with transaction.atomic():
+            rows = list(
+                Task.objects.select_for_update(skip_locked=True)
+                .filter(due_date__lte=now, status__in=['new', 'in_progress'])
+                .exclude(id__in=exclude_ids)
+                .order_by('due_date')
+                .values(*TASK_FIELDS)[:limit]
+            )
+            if rows:
+                Task.objects.filter(id__in=[row['id'] for row in rows]).update(status='overdue')
+        if rows:
+            invalidate_tasks_cache()
+        return rows
+    
+    async def restore_task_statuses(rows):
+        """Возвращает задачам статус, который был до пометки 'overdue'"""
+        for status in {row['status'] for row in rows}:
+            await Task.objects.filter(
+                id__in=[row['id'] for row in rows if row['status'] == status],
+                status='overdue'
+            ).aupdate(status=status)
+        invalidate_tasks_cache()
 else:
     logger.error("Django недоступен! Бот не может работать с базой данных.")
     sys.exit(1)
 
 # ========== ПРОВЕРКА ДЕДЛАЙНОВ ==========
+# Адаптивный интервал проверки дедлайнов (секунды): проверка назначается на ближайший срок,
+# но не чаще DEADLINE_POLL_INTERVAL и не реже DEADLINE_MAX_INTERVAL
+DEADLINE_POLL_INTERVAL = int(os.environ.get('DEADLINE_POLL_INTERVAL', '30'))
+DEADLINE_MAX_INTERVAL = int(os.environ.get('DEADLINE_MAX_INTERVAL', '900'))
+# Множитель увеличения интервала, пока задач со сроком нет
+DEADLINE_BACKOFF_FACTOR = float(os.environ.get('DEADLINE_BACKOFF_FACTOR', '2'))
+
+# Будит цикл проверки раньше срока (например, после создания задачи в боте)
+deadline_wakeup = asyncio.Event()
+
+# Ограничение одновременных отправок и их частоты (лимит Telegram - 30 сообщений/сек)
+SEND_CONCURRENCY = 20
+send_rate_limiter = AsyncLimiter(30, 1)
+
+# Сколько просроченных задач обрабатывается за один проход
+DEADLINE_BATCH_SIZE = 200
+
+
+async def send_deadline_notification(task, semaphore):
+    """Отправка уведомления о дедлайне одной задачи"""
+    description = task['description'] if task['description'] else "Нет описания"
+    
+    due_date_str = format_due_date(task['due_date'], with_year=True)
+    
+    text = (
+        # "⏰ **Дедлайн наступил!** ⏰\n\n"
+        f"📝 **Задача:** {task['title']}\n\n"
+        f"📝 **Описание:**\n{description}\n\n"
+        f"📅 **Срок:** {due_date_str}\n\n"
+        "⚠️ Задача наступила!"
+    )
+    
+    async with semaphore, send_rate_limiter:
+        await bot.send_message(YOUR_CHAT_ID, text)
+
+
+async def send_deadline_notifications(tasks, semaphore):
+    """Параллельная отправка уведомлений, возвращает задачи, которые отправить не удалось"""
+    results = await asyncio.gather(
+        *(send_deadline_notification(task, semaphore) for task in tasks),
+        return_exceptions=True
+    )
+    
+    failed = []
+    for task, result in zip(tasks, results):
+        if isinstance(result, Exception):
+            logger.error(f"Ошибка отправки: {result}")
+            failed.append(task)
+        else:
+            logger.info(f"Уведомление отправлено: {task['title']}")
+    return failed
+
+
 async def check_deadlines():
-    """Проверка дедлайнов"""
+    """Проверка дедлайнов, возвращает число задач, уведомление о которых не отправилось"""
+    if not YOUR_CHAT_ID:
+        return 0
+    
+    failed_ids = []
     try:
-        tasks = await get_pending_tasks_with_deadline()
         now = timezone.now()
+        semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+        
+        # Задачи помечаются просроченными частями: одна транзакция (SELECT + UPDATE) на пачку
+        while True:
+            tasks = await flip_overdue_and_return(now, DEADLINE_BATCH_SIZE, failed_ids)
+            if not tasks:
+                break
+            
+            failed = await send_deadline_notifications(tasks, semaphore)
+            if failed:
+                # Неотправленные уведомления повторятся при следующей проверке
+                await restore_task_statuses(failed)
+                failed_ids.extend(task['id'] for task in failed)
+            
+            if len(tasks) < DEADLINE_BATCH_SIZE:
+                break
         
-        for task in tasks:
-            if task.due_date and now >= task.due_date and task.status not in ['done', 'overdue']:
-                description = task.description if task.description else "Нет описания"
-                
-                due_date_local = localtime(task.due_date)
-                due_date_str = due_date_local.strftime('%d.%m.%Y %H:%M')
-                
-                text = (
-                    # "⏰ **Дедлайн наступил!** ⏰\n\n"
-                    f"📝 **Задача:** {task.title}\n\n"
-                    f"📝 **Описание:**\n{description}\n\n"
-                    f"📅 **Срок:** {due_date_str}\n\n"
-                    "⚠️ Задача наступила!"
-                )
-                
-                if YOUR_CHAT_ID:
-                    try:
-                        await bot.send_message(YOUR_CHAT_ID, text, parse_mode="Markdown")
-                        logger.info(f"Уведомление отправлено: {task.title}")
-                        await mark_task_overdue(task.id)
-                    except Exception as e:
-                        logger.error(f"Ошибка отправки: {e}")
-                        
     except Exception as e:
         logger.error(f"Ошибка проверки дедлайнов: {e}")
+    return len(failed_ids)
+
+
+async def next_check_delay(idle_interval, stuck):
+    """
+    Пауза до следующей проверки и новый интервал простоя.
+    stuck - число просроченных задач, уведомление о которых не отправилось:
+    их повтор откладывается всё дольше, но не позже ближайшего будущего срока.
+    """
+    now = timezone.now()
+    try:
+        next_due = await get_next_deadline(now)
+    except Exception as e:
+        logger.error(f"Ошибка получения ближайшего дедлайна: {e}")
+        return DEADLINE_POLL_INTERVAL, idle_interval
+    
+    backoff_interval = min(idle_interval * DEADLINE_BACKOFF_FACTOR, DEADLINE_MAX_INTERVAL)
+    if next_due is None:
+        # Будущих сроков нет - проверяем всё реже
+        return idle_interval, backoff_interval
+    
+    seconds = (next_due - now).total_seconds()
+    delay = min(max(seconds, DEADLINE_POLL_INTERVAL), DEADLINE_MAX_INTERVAL)
+    if stuck:
+        return min(delay, idle_interval), backoff_interval
+    return delay, DEADLINE_POLL_INTERVAL
+
+
+async def deadline_loop():
+    """Проверка дедлайнов с адаптивным интервалом"""
+    idle_interval = DEADLINE_POLL_INTERVAL
+    while True:
+        stuck = await check_deadlines()
+        delay, idle_interval = await next_check_delay(idle_interval, stuck)
+        try:
+            await asyncio.wait_for(deadline_wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        deadline_wakeup.clear()
 
 
 # ========== КЛАВИАТУРЫ ==========
-def get_main_keyboard():
-    keyboard = [
-        [{"text": "📋 Все задачи"}],
-        [{"text": "➕ Новая задача"}],
-        [{"text": "⏰ Напоминания"}],
-        [{"text": "🌐 Веб-интерфейс"}],
-    ]
-    return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
+# Клавиатуры не меняются за время работы бота, поэтому создаются один раз
+WEB_URL = "https://planer-pihtulovevgeny.amvera.io/"
+WEB_CREATE_URL = "https://planer-pihtulovevgeny.amvera.io/tasks/create/"
+WEB_LIST_URL = "https://planer-pihtulovevgeny.amvera.io/tasks/"
+
+MAIN_KEYBOARD = ReplyKeyboardMarkup(keyboard=[
+    [KeyboardButton(text="📋 Все задачи")],
+    [KeyboardButton(text="➕ Новая задача")],
+    [KeyboardButton(text="⏰ Напоминания")],
+    [KeyboardButton(text="🌐 Веб-интерфейс")],
+], resize_keyboard=True)
+
+CANCEL_KEYBOARD = ReplyKeyboardMarkup(keyboard=[[KeyboardButton(text="❌ Отмена")]], resize_keyboard=True)
+
+SKIP_KEYBOARD = ReplyKeyboardMarkup(keyboard=[[KeyboardButton(text="⏩ Пропустить")]], resize_keyboard=True)
+
+BACK_TO_MENU_BUTTON = InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_menu")
+
+BACK_TO_MENU_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[[BACK_TO_MENU_BUTTON]])
+
+GO_TO_DELETE_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="🗑️ Удалить задачу", callback_data="go_to_delete")]
+])
+
+WEB_INTERFACE_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="🚀 Открыть планировщик", url=WEB_URL)],
+    [InlineKeyboardButton(text="📋 Создать задачу", callback_data="web_create_task")],
+    [InlineKeyboardButton(text="📊 Все задачи", callback_data="web_list_tasks")]
+])
+
+WEB_CREATE_TASK_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="🚀 Создать задачу", url=WEB_CREATE_URL)],
+    [BACK_TO_MENU_BUTTON]
+])
+
+WEB_LIST_TASKS_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="🚀 Открыть список", url=WEB_LIST_URL)],
+    [BACK_TO_MENU_BUTTON]
+])
+
 
+# Иконки статусов задач
+STATUS_ICONS = {
+    "new": "🆕",
+    "done": "✅",
+    "in_progress": "⏳",
+    "overdue": "⚠️",
+}
 
-def get_cancel_keyboard():
-    keyboard = [[{"text": "❌ Отмена"}]]
-    return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
 
+def format_due_date(due_date, with_year=False):
+    """Срок в локальном времени: 'ДД.ММ ЧЧ:ММ' или 'ДД.ММ.ГГГГ ЧЧ:ММ'"""
+    local = due_date.astimezone(LOCAL_TZ)
+    if with_year:
+        return f"{local.day:02d}.{local.month:02d}.{local.year:04d} {local.hour:02d}:{local.minute:02d}"
+    return f"{local.day:02d}.{local.month:02d} {local.hour:02d}:{local.minute:02d}"
 
-def get_skip_keyboard():
-    keyboard = [[{"text": "⏩ Пропустить"}]]
-    return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
+
+def format_due_dates(tasks):
+    """Сроки задач в локальном времени ('ДД.ММ ЧЧ:ММ')"""
+    return [format_due_date(task['due_date']) if task['due_date'] else "" for task in tasks]
+
+
+def parse_due_date(text):
+    """Разбор срока в формате 'ДД.ММ.ГГГГ ЧЧ:ММ'"""
+    digits = text[0:2] + text[3:5] + text[6:10] + text[11:13] + text[14:16]
+    if (len(text) == 16 and text[2] == '.' and text[5] == '.' and text[10] == ' '
+            and text[13] == ':' and digits.isdigit()):
+        naive = datetime(int(text[6:10]), int(text[3:5]), int(text[0:2]), int(text[11:13]), int(text[14:16]))
+    else:
+        # Запись без ведущих нулей и т.п. - общий разбор
+        naive = datetime.strptime(text, "%d.%m.%Y %H:%M")
+    return timezone.make_aware(naive)
 
 
 # ========== FSM СОСТОЯНИЯ ==========
@@ -220,6 +448,11 @@ class CreateTask(StatesGroup):
     due_date = State()
 
 
+# ========== CALLBACK DATA ==========
+class DeleteTaskCallback(CallbackData, prefix="delete"):
+    task_id: int
+
+
 # ========== ОБРАБОТЧИКИ ==========
 @dp.message(CommandStart())
 async def cmd_start(message: types.Message):
@@ -230,7 +463,7 @@ async def cmd_start(message: types.Message):
         "• Создание задач\n"
         "• Автоматические напоминания о дедлайнах"
     )
-    await message.answer(welcome_text, parse_mode="Markdown", reply_markup=get_main_keyboard())
+    await message.answer(welcome_text, reply_markup=MAIN_KEYBOARD)
     logger.info(f"Пользователь {message.from_user.id} запустил бота")
 
 
@@ -239,146 +472,131 @@ async def show_all_tasks(message: types.Message):
     tasks = await get_all_tasks()
     
     if not tasks:
-        await message.answer("📭 Задач пока нет!", reply_markup=get_main_keyboard())
+        await message.answer("📭 Задач пока нет!", reply_markup=MAIN_KEYBOARD)
         return
     
-    text = "📋 **Все задачи:**\n\n"
+    due_strs = format_due_dates(tasks)
+    parts = ["📋 **Все задачи:**\n\n"]
     
-    for i, task in enumerate(tasks, 1):
-        status_icon = "✅" if task.status == "done" else "⏳" if task.status == "in_progress" else "🆕"
-        if task.status == "overdue":
-            status_icon = "⚠️"
-        
-        due_date_str = ""
-        if task.due_date:
-            due_date_local = localtime(task.due_date)
-            due_date_str = f" 📅 {due_date_local.strftime('%d.%m %H:%M')}"
+    for i, (task, due_str) in enumerate(zip(tasks, due_strs), 1):
+        status_icon = STATUS_ICONS.get(task['status'], "🆕")
+        due_date_str = f" 📅 {due_str}" if due_str else ""
         
         desc_str = ""
-        if task.description:
-            desc = task.description[:50] + "..." if len(task.description) > 50 else task.description
+        description = task['description']
+        if description:
+            desc = description[:50] + "..." if len(description) > 50 else description
             desc_str = f"\n   📝 {desc}"
         
-        text += f"{i}. {status_icon} *{task.title}*{due_date_str}{desc_str}\n"
+        parts.append(f"{i}. {status_icon} *{task['title']}*{due_date_str}{desc_str}\n")
     
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🗑️ Удалить задачу", callback_data="go_to_delete")]
-    ])
+    text = "".join(parts)
     
-    await message.answer(text, parse_mode="Markdown", reply_markup=keyboard)
+    await message.answer(text, reply_markup=GO_TO_DELETE_KEYBOARD)
 
 
 @dp.message(F.text == "🌐 Веб-интерфейс")
 async def show_web_interface(message: types.Message):
     """Показать ссылку на веб-интерфейс"""
-    web_url = "https://planer-pihtulovevgeny.amvera.io/"
-    
     text = (
         f"🌐 **Веб-интерфейс планировщика задач**\n\n"
         f"Перейдите по ссылке для работы через браузер:\n"
-        f"🔗 {web_url}\n\n"
+        f"🔗 {WEB_URL}\n\n"
         f"💡 В веб-интерфейсе доступны все функции:"
     )
     
-    # Inline клавиатура для быстрого перехода
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🚀 Открыть планировщик", url=web_url)],
-        [InlineKeyboardButton(text="📋 Создать задачу", callback_data="web_create_task")],
-        [InlineKeyboardButton(text="📊 Все задачи", callback_data="web_list_tasks")]
-    ])
-    
-    await message.answer(text, parse_mode="Markdown", reply_markup=keyboard)
+    await message.answer(text, reply_markup=WEB_INTERFACE_KEYBOARD)
 
 
 @dp.callback_query(F.data == "web_create_task")
 async def web_create_task_callback(callback: types.CallbackQuery):
     """Переход к созданию задачи через веб"""
-    web_url = "https://planer-pihtulovevgeny.amvera.io/tasks/create/"
-    
     text = (
         "➕ **Создание задачи через веб-интерфейс**\n\n"
-        f"🔗 {web_url}"
+        f"🔗 {WEB_CREATE_URL}"
     )
     
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🚀 Создать задачу", url=web_url)],
-        [InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_menu")]
-    ])
-    
-    await callback.message.edit_text(text, parse_mode="Markdown", reply_markup=keyboard)
+    await callback.message.edit_text(text, reply_markup=WEB_CREATE_TASK_KEYBOARD)
 
 
 @dp.callback_query(F.data == "web_list_tasks")
 async def web_list_tasks_callback(callback: types.CallbackQuery):
     """Переход к списку задач через веб"""
-    web_url = "https://planer-pihtulovevgeny.amvera.io/tasks/"
-    
     text = (
         "📋 **Все задачи через веб-интерфейс**\n\n"
-        f"🔗 {web_url}"
+        f"🔗 {WEB_LIST_URL}"
     )
     
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🚀 Открыть список", url=web_url)],
-        [InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_menu")]
-    ])
-    
-    await callback.message.edit_text(text, parse_mode="Markdown", reply_markup=keyboard)
+    await callback.message.edit_text(text, reply_markup=WEB_LIST_TASKS_KEYBOARD)
 
 
-@dp.callback_query(F.data == "go_to_delete")
-async def go_to_delete(callback: types.CallbackQuery):
-    tasks = await get_all_tasks()
-    
+def build_delete_view(tasks):
+    """Текст и клавиатура экрана выбора задачи для удаления"""
     if not tasks:
-        await callback.message.edit_text("📭 Задач нет!", reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_menu")]
-        ]))
-        return
+        return "📭 Задач нет!", BACK_TO_MENU_KEYBOARD
     
-    text = "🗑️ **Выберите задачу для удаления:**\n\n"
+    due_strs = format_due_dates(tasks)
+    parts = ["🗑️ **Выберите задачу для удаления:**\n\n"]
     
-    for i, task in enumerate(tasks, 1):
-        status_icon = "✅" if task.status == "done" else "⏳" if task.status == "in_progress" else "🆕"
-        if task.status == "overdue":
-            status_icon = "⚠️"
-        
-        due_date_str = ""
-        if task.due_date:
-            due_date_local = localtime(task.due_date)
-            due_date_str = f" 📅 {due_date_local.strftime('%d.%m %H:%M')}"
+    for i, (task, due_str) in enumerate(zip(tasks, due_strs), 1):
+        status_icon = STATUS_ICONS.get(task['status'], "🆕")
+        due_date_str = f" 📅 {due_str}" if due_str else ""
         
-        text += f"{i}. {status_icon} *{task.title}*{due_date_str}\n"
+        parts.append(f"{i}. {status_icon} *{task['title']}*{due_date_str}\n")
+    
+    text = "".join(parts)
     
     keyboard = []
     row = []
     for i, task in enumerate(tasks, 1):
-        row.append(InlineKeyboardButton(text=str(i), callback_data=f"delete_{task.id}"))
+        row.append(InlineKeyboardButton(text=str(i), callback_data=DeleteTaskCallback(task_id=task['id']).pack()))
         if len(row) == 5:
             keyboard.append(row)
             row = []
     if row:
         keyboard.append(row)
     
-    keyboard.append([InlineKeyboardButton(text="🔙 Назад", callback_data="back_to_menu")])
+    keyboard.append([BACK_TO_MENU_BUTTON])
     
-    await callback.message.edit_text(text, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard))
+    return text, InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
-@dp.callback_query(F.data.startswith("delete_"))
-async def delete_task_callback(callback: types.CallbackQuery):
-    task_id = int(callback.data.replace("delete_", ""))
-    task = await get_task_by_id(task_id)
+@dp.callback_query(F.data == "go_to_delete")
+async def go_to_delete(callback: types.CallbackQuery):
+    tasks = await get_all_tasks()
+    text, keyboard = build_delete_view(tasks)
+    await callback.message.edit_text(text, reply_markup=keyboard)
+
+
+@dp.callback_query(DeleteTaskCallback.filter())
+async def delete_task_callback(callback: types.CallbackQuery, callback_data: DeleteTaskCallback):
+    task_id = callback_data.task_id
+    
+    # Список из кэша (или один SELECT): из него же берём название задачи и показываем остаток
+    tasks = await get_all_tasks()
+    task_title = next((t['title'] for t in tasks if t['id'] == task_id), None)
+    if task_title is None:
+        task_title = await get_task_title(task_id)
     
-    if task:
-        task_title = task.title
-        await delete_task_by_id(task_id)
+    # Список мог быть взят из кэша, поэтому успех определяется по результату DELETE
+    if task_title is not None and await delete_task_by_id(task_id):
+        tasks = [t for t in tasks if t['id'] != task_id]
         await callback.answer(f"✅ Задача '{task_title}' удалена!")
         logger.info(f"Пользователь {callback.from_user.id} удалил задачу: {task_title}")
     else:
+        # Задачу уже удалили в другом месте (например, в веб-интерфейсе) - убираем её из списка и кэша
+        tasks = [t for t in tasks if t['id'] != task_id]
+        forget_cached_task(task_id)
         await callback.answer("Задача не найдена!")
     
-    await show_all_tasks(callback.message)
+    # Обновляем текущее сообщение вместо отправки нового списка
+    text, keyboard = build_delete_view(tasks)
+    try:
+        await callback.message.edit_text(text, reply_markup=keyboard)
+    except TelegramBadRequest as e:
+        if "message is not modified" not in str(e):
+            logger.warning(f"Не удалось обновить сообщение: {e}")
+            await callback.message.answer(text, reply_markup=keyboard)
 
 
 @dp.callback_query(F.data == "back_to_menu")
@@ -392,8 +610,7 @@ async def create_task_start(message: types.Message, state: FSMContext):
     await message.answer(
         "➕ **Новая задача**\n\n"
         "📝 Введите название задачи:",
-        parse_mode="Markdown",
-        reply_markup=get_cancel_keyboard()
+        reply_markup=CANCEL_KEYBOARD
     )
     await state.set_state(CreateTask.title)
 
@@ -403,7 +620,7 @@ async def process_title(message: types.Message, state: FSMContext):
     text = message.text
     
     if text == "❌ Отмена":
-        await message.answer("❌ Отменено.", reply_markup=get_main_keyboard())
+        await message.answer("❌ Отменено.", reply_markup=MAIN_KEYBOARD)
         await state.clear()
         return
     
@@ -412,8 +629,7 @@ async def process_title(message: types.Message, state: FSMContext):
     await message.answer(
         "📝 **Описание задачи**\n\n"
         "Введите описание или нажмите 'Пропустить':",
-        parse_mode="Markdown",
-        reply_markup=get_skip_keyboard()
+        reply_markup=SKIP_KEYBOARD
     )
     await state.set_state(CreateTask.description)
 
@@ -423,7 +639,7 @@ async def process_description(message: types.Message, state: FSMContext):
     text = message.text
     
     if text == "❌ Отмена":
-        await message.answer("❌ Отменено.", reply_markup=get_main_keyboard())
+        await message.answer("❌ Отменено.", reply_markup=MAIN_KEYBOARD)
         await state.clear()
         return
     
@@ -435,8 +651,7 @@ async def process_description(message: types.Message, state: FSMContext):
         "Формат: ДД.ММ.ГГГГ ЧЧ:ММ\n"
         "Например: 25.01.2026 14:30\n\n"
         "⏩ - Без срока",
-        parse_mode="Markdown",
-        reply_markup=get_skip_keyboard()
+        reply_markup=SKIP_KEYBOARD
     )
     await state.set_state(CreateTask.due_date)
 
@@ -446,7 +661,7 @@ async def process_due_date(message: types.Message, state: FSMContext):
     text = message.text
     
     if text == "❌ Отмена":
-        await message.answer("❌ Отменено.", reply_markup=get_main_keyboard())
+        await message.answer("❌ Отменено.", reply_markup=MAIN_KEYBOARD)
         await state.clear()
         return
     
@@ -454,11 +669,9 @@ async def process_due_date(message: types.Message, state: FSMContext):
         due_date = None
     else:
         try:
-            due_date = timezone.make_aware(
-                timezone.datetime.strptime(text, "%d.%m.%Y %H:%M")
-            )
+            due_date = parse_due_date(text)
         except ValueError:
-            await message.answer("❌ Неверный формат!\n\nФормат: ДД.ММ.ГГГГ ЧЧ:ММ", reply_markup=get_skip_keyboard())
+            await message.answer("❌ Неверный формат!\n\nФормат: ДД.ММ.ГГГГ ЧЧ:ММ", reply_markup=SKIP_KEYBOARD)
             return
     
     await state.update_data(due_date=due_date)
@@ -469,78 +682,103 @@ async def process_due_date(message: types.Message, state: FSMContext):
         description=data.get('description', ''),
         due_date=data.get('due_date')
     )
+    if task.due_date:
+        # Новый срок может оказаться ближе запланированной проверки
+        deadline_wakeup.set()
     
-    due_date_str = f"\n📅 {localtime(task.due_date).strftime('%d.%m.%Y %H:%M')}" if task.due_date else ""
+    due_date_str = f"\n📅 {format_due_date(task.due_date, with_year=True)}" if task.due_date else ""
     
     response = f"✅ **Задача создана!**\n\n📝 *{task.title}*{due_date_str}"
     
-    await message.answer(response, parse_mode="Markdown", reply_markup=get_main_keyboard())
+    await message.answer(response, reply_markup=MAIN_KEYBOARD)
     await state.clear()
 
 
 @dp.message(F.text == "⏰ Напоминания")
 async def show_reminders(message: types.Message):
-    tasks = await get_pending_tasks_with_deadline()
     now = timezone.now()
     
-    overdue = [t for t in tasks if t.due_date and now >= t.due_date]
-    upcoming = [t for t in tasks if t.due_date and now < t.due_date and (t.due_date - now).total_seconds() < 86400]
+    # Фильтрация по сроку в БД: выбираются только строки, которые будут показаны
+    overdue = await get_pending_tasks_due_between(end=now)
+    upcoming = await get_pending_tasks_due_between(start=now, end=now + timedelta(days=1))
     
-    text = "⏰ **Напоминания:**\n\n"
+    parts = ["⏰ **Напоминания:**\n\n"]
     
     if overdue:
-        text += "⚠️ **Просроченные:**\n"
-        for task in overdue:
-            desc = (task.description[:30] + "...") if task.description and len(task.description) > 30 else (task.description or "")
-            text += f"📝 *{task.title}*\n   📅 {localtime(task.due_date).strftime('%d.%m %H:%M')}\n"
+        parts.append("⚠️ **Просроченные:**\n")
+        for task, due_str in zip(overdue, format_due_dates(overdue)):
+            description = task['description']
+            desc = (description[:30] + "...") if description and len(description) > 30 else (description or "")
+            parts.append(f"📝 *{task['title']}*\n   📅 {due_str}\n")
             if desc:
-                text += f"   📝 {desc}\n\n"
+                parts.append(f"   📝 {desc}\n\n")
     
     if upcoming:
-        text += "⏳ **Скоро (до 24ч):**\n"
-        for task in upcoming:
-            hours = int((task.due_date - now).total_seconds() // 3600)
-            desc = (task.description[:30] + "...") if task.description and len(task.description) > 30 else (task.description or "")
-            text += f"📝 *{task.title}* - {hours}ч\n   📅 {localtime(task.due_date).strftime('%d.%m %H:%M')}\n"
+        parts.append("⏳ **Скоро (до 24ч):**\n")
+        for task, due_str in zip(upcoming, format_due_dates(upcoming)):
+            hours = int((task['due_date'] - now).total_seconds() // 3600)
+            description = task['description']
+            desc = (description[:30] + "...") if description and len(description) > 30 else (description or "")
+            parts.append(f"📝 *{task['title']}* - {hours}ч\n   📅 {due_str}\n")
             if desc:
-                text += f"   📝 {desc}\n\n"
+                parts.append(f"   📝 {desc}\n\n")
     
     if not overdue and not upcoming:
-        text += "✅ Нет напоминаний!"
+        parts.append("✅ Нет напоминаний!")
     
-    await message.answer(text, parse_mode="Markdown", reply_markup=get_main_keyboard())
+    text = "".join(parts)
+    
+    await message.answer(text, reply_markup=MAIN_KEYBOARD)
 
 
 @dp.message(F.text == "❌ Отмена")
 async def cancel(message: types.Message, state: FSMContext):
-    await message.answer("❌ Отменено.", reply_markup=get_main_keyboard())
+    await message.answer("❌ Отменено.", reply_markup=MAIN_KEYBOARD)
     await state.clear()
 
 
 # ========== ЗАПУСК ==========
 async def main():
     """Запуск бота"""
+    deadline_task = None
     try:
         logger.info("🤖 Бот запускается...")
-        
+
+        # Eager-задачи (Python 3.12+): обработчик выполняется сразу до первого реального ожидания
+        if sys.version_info >= (3, 12):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
         # Проверяем БД
         db_ok = await check_database()
         if not db_ok:
             logger.error("Не удалось подключиться к базе данных!")
         
-        # Запускаем планировщик
-        scheduler.add_job(check_deadlines, IntervalTrigger(seconds=60), id='check_deadlines')
-        scheduler.start()
-        logger.info("📅 Планировщик дедлайнов запущен")
+        # Запускаем планировщик (без чата для уведомлений проверять дедлайны незачем)
+        if YOUR_CHAT_ID:
+            deadline_task = asyncio.create_task(deadline_loop())
+            logger.info("📅 Планировщик дедлайнов запущен")
+        else:
+            logger.warning("TELEGRAM_CHAT_ID не задан, планировщик дедлайнов не запущен")
         
         # Запускаем поллинг
         await bot.delete_webhook(drop_pending_updates=True)
-        await dp.start_polling(bot)
+        # Только типы обновлений, для которых есть обработчики (message, callback_query)
+        await dp.start_polling(
+            bot,
+            allowed_updates=dp.resolve_used_update_types(),
+            polling_timeout=30,
+        )
     except Exception as e:
         logger.error(f"Критическая ошибка: {e}")
     finally:
+        if deadline_task is not None:
+            deadline_task.cancel()
         await bot.session.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if uvloop is not None:
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        asyncio.run(main())
@@ -0,0 +1,20 @@
+"""
+Django settings for the Telegram bot process.
+
+Бот использует только модели, поэтому веб-приложения, middleware и шаблоны не загружаются.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'django.contrib.contenttypes',
+    'django.contrib.auth',
+    'tasks',
+]
+
+MIDDLEWARE = []
+
+TEMPLATES = []
+
+# Бот не обрабатывает HTTP-запросы
+ROOT_URLCONF = None
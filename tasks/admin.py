@@ -6,4 +6,9 @@ from .models import Task
 class TaskAdmin(admin.ModelAdmin):
     list_display = ['id', 'title', 'status', 'created_at', 'due_date']
     list_filter = ['status']
-    search_fields = ['title', 'description']
\ No newline at end of file
+    search_fields = ['title', 'description']
+    list_per_page = 50
+    # Без COUNT(*) по всей таблице на каждой странице
+    show_full_result_count = False
+    # Внешних ключей нет - JOIN не нужен
+    list_select_related = ()
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-15 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_remove_task_category_delete_category'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False)), fields=['status', 'due_date'], name='task_status_due_idx'),
+        ),
+    ]
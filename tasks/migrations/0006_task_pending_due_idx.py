@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-15 21:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_status_due_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_status_due_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status__in', ['new', 'in_progress'])), fields=['due_date'], name='task_pending_due_idx'),
+        ),
+    ]
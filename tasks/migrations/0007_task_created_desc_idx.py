@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-15 21:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_pending_due_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-created_at'], name='task_created_desc_idx'),
+        ),
+    ]
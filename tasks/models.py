@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
 
@@ -28,9 +29,25 @@ class Task(models.Model):
     def save(self, *args, **kwargs):
         if self.due_date and timezone.is_naive(self.due_date):
             self.due_date = timezone.make_aware(self.due_date)
+            # Частичное сохранение должно записать и исправленный срок
+            # (пустой update_fields остаётся no-op, как в Django)
+            if kwargs.get('update_fields'):
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'due_date'}
         super().save(*args, **kwargs)
     
     class Meta:
         verbose_name = 'Задача'
         verbose_name_plural = 'Задачи'
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Фильтр по статусу (бот, list_filter в админке) с последующим сроком
+            models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+            # Частичный индекс для проверки дедлайнов незавершённых задач
+            models.Index(
+                fields=['due_date'],
+                name='task_pending_due_idx',
+                condition=Q(status__in=['new', 'in_progress']),
+            ),
+            # Сортировка по умолчанию (ordering) в списках и админке
+            models.Index(fields=['-created_at'], name='task_created_desc_idx'),
+        ]
\ No newline at end of file
@@ -1,3 +1,172 @@
+import importlib.util
+import os
+from datetime import datetime, timedelta
+from unittest import mock, skipUnless
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Task
+from .views import TASKS_PER_PAGE
+
+
+class TaskSaveTest(TestCase):
+    """Task.save: приведение наивного срока и update_fields"""
+
+    def setUp(self):
+        self.task = Task.objects.create(title='Задача')
+
+    def test_naive_due_date_saved_with_partial_update_fields(self):
+        self.task.title = 'Новое название'
+        self.task.due_date = datetime(2026, 1, 25, 14, 30)
+        self.task.save(update_fields=['title'])
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, 'Новое название')
+        self.assertTrue(timezone.is_aware(self.task.due_date))
+        self.assertEqual(self.task.due_date, timezone.make_aware(datetime(2026, 1, 25, 14, 30)))
+
+    def test_empty_update_fields_is_noop(self):
+        self.task.due_date = datetime(2026, 1, 25, 14, 30)
+        with CaptureQueriesContext(connection) as queries:
+            self.task.save(update_fields=[])
+
+        self.assertEqual(len(queries), 0)
+        self.task.refresh_from_db()
+        self.assertIsNone(self.task.due_date)
+
+
+class TaskViewsTest(TestCase):
+    """Представления, которые меняют задачу одним запросом без get_object_or_404"""
+
+    def setUp(self):
+        self.due_date = timezone.make_aware(datetime(2026, 1, 25, 14, 30))
+        self.task = Task.objects.create(title='Задача', description='Описание', due_date=self.due_date)
+
+    def test_toggle_cycles_status(self):
+        url = reverse('task_toggle', args=[self.task.id])
+        for expected in ['in_progress', 'done', 'new']:
+            response = self.client.get(url)
+            self.assertRedirects(response, reverse('task_list'), fetch_redirect_response=False)
+            self.task.refresh_from_db()
+            self.assertEqual(self.task.status, expected)
+
+    def test_toggle_overdue_returns_to_new(self):
+        Task.objects.filter(id=self.task.id).update(status='overdue')
+        self.client.get(reverse('task_toggle', args=[self.task.id]))
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'new')
+
+    def test_toggle_missing_task_404(self):
+        response = self.client.get(reverse('task_toggle', args=[self.task.id + 1]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_update_saves_fields(self):
+        response = self.client.post(reverse('task_update', args=[self.task.id]), {
+            'title': 'Новое название',
+            'description': 'Новое описание',
+            'due_date': '2026-02-01T09:00',
+        })
+        self.assertRedirects(response, reverse('task_list'), fetch_redirect_response=False)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, 'Новое название')
+        self.assertEqual(self.task.description, 'Новое описание')
+        self.assertEqual(self.task.due_date, timezone.make_aware(datetime(2026, 2, 1, 9, 0)))
+
+    def test_update_empty_due_date_clears_it(self):
+        self.client.post(reverse('task_update', args=[self.task.id]), {'title': 'Задача', 'due_date': ''})
+        self.task.refresh_from_db()
+        self.assertIsNone(self.task.due_date)
+
+    def test_update_invalid_due_date_keeps_stored_value(self):
+        self.client.post(reverse('task_update', args=[self.task.id]), {
+            'title': 'Задача',
+            'due_date': 'не дата',
+        })
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.due_date, self.due_date)
+
+    def test_update_missing_task_404(self):
+        response = self.client.post(reverse('task_update', args=[self.task.id + 1]), {'title': 'Задача'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_delete_removes_task(self):
+        response = self.client.post(reverse('task_delete', args=[self.task.id]))
+        self.assertRedirects(response, reverse('task_list'), fetch_redirect_response=False)
+        self.assertFalse(Task.objects.filter(id=self.task.id).exists())
+
+    def test_delete_missing_task_404(self):
+        response = self.client.post(reverse('task_delete', args=[self.task.id + 1]))
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskListViewTest(TestCase):
+    """Постраничный список задач"""
+
+    TOTAL = TASKS_PER_PAGE + 5
+
+    def setUp(self):
+        Task.objects.bulk_create(Task(title=f'Задача {i}') for i in range(self.TOTAL))
+
+    def test_first_page_and_total_in_header(self):
+        response = self.client.get(reverse('task_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['tasks']), TASKS_PER_PAGE)
+        self.assertContains(response, f'Все задачи ({self.TOTAL})')
+        self.assertContains(response, '?page=2')
+
+    def test_second_page_returns_remainder(self):
+        response = self.client.get(reverse('task_list'), {'page': 2})
+        self.assertEqual(response.context['page'].number, 2)
+        self.assertEqual(len(response.context['tasks']), self.TOTAL - TASKS_PER_PAGE)
+        self.assertContains(response, '?page=1')
+
+    def test_out_of_range_page_falls_back_to_last(self):
+        response = self.client.get(reverse('task_list'), {'page': 99})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['page'].number, 2)
+
+    def test_invalid_page_falls_back_to_first(self):
+        response = self.client.get(reverse('task_list'), {'page': 'abc'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['page'].number, 1)
+        self.assertEqual(len(response.context['tasks']), TASKS_PER_PAGE)
+
+
+@skipUnless(importlib.util.find_spec('aiogram'), 'aiogram не установлен')
+class DeadlineScheduleTest(TestCase):
+    """Интервал проверки дедлайнов в боте"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with mock.patch.dict(os.environ, {'TELEGRAM_BOT_TOKEN': '123456:test-token'}):
+            from bot import bot
+        cls.bot = bot
+
+    async def test_stuck_overdue_task_does_not_delay_future_deadlines(self):
+        now = timezone.now()
+        # Непарный "_" ломает Markdown - уведомление об этой задаче не отправляется никогда
+        await Task.objects.acreate(title='broken_title', due_date=now - timedelta(hours=1))
+        await Task.objects.acreate(title='Скоро', due_date=now + timedelta(seconds=90))
+
+        send_message = mock.AsyncMock(side_effect=RuntimeError("can't parse entities"))
+        with mock.patch.object(self.bot, 'YOUR_CHAT_ID', 1), \
+                mock.patch.object(self.bot.bot, 'send_message', send_message):
+            stuck = await self.bot.check_deadlines()
+        self.assertEqual(stuck, 1)
+        self.assertEqual(await Task.objects.filter(title='broken_title').values_list('status', flat=True).aget(), 'new')
+
+        delays = []
+        idle_interval = self.bot.DEADLINE_POLL_INTERVAL
+        for _ in range(4):
+            delay, idle_interval = await self.bot.next_check_delay(idle_interval, stuck)
+            delays.append(delay)
 
-# Create your tests here.
+        # Повтор для зависшей задачи откладывается, но будущий срок не пропускается
+        self.assertEqual(delays[:2], [30, 60])
+        self.assertTrue(all(delay <= 90 for delay in delays))
+        self.assertGreater(delays[-1], 80)
@@ -1,3 +1,6 @@
+from django.core.paginator import Paginator
+from django.db.models import Case, When, Value
+from django.http import Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
 from datetime import datetime
@@ -9,10 +12,17 @@ def landing(request):
     return render(request, 'tasks/landing.html')
 
 
+TASKS_PER_PAGE = 25
+
+
 def task_list(request):
-    """Главная страница - список задач"""
-    tasks = Task.objects.all()
-    return render(request, 'tasks/task_list.html', {'tasks': tasks})
+    """Главная страница - список задач (постранично)"""
+    tasks = Task.objects.only('id', 'title', 'description', 'status', 'due_date').order_by('-created_at')
+    page = Paginator(tasks, TASKS_PER_PAGE).get_page(request.GET.get('page'))
+    return render(request, 'tasks/task_list.html', {
+        'tasks': page.object_list,
+        'page': page,
+    })
 
 
 def task_create(request):
@@ -45,26 +55,29 @@ def task_create(request):
 
 def task_update(request, pk):
     """Редактирование задачи"""
-    task = get_object_or_404(Task, id=pk)
-    
     if request.method == 'POST':
-        task.title = request.POST.get('title')
-        task.description = request.POST.get('description', '')
+        fields = {
+            'title': request.POST.get('title'),
+            'description': request.POST.get('description', ''),
+        }
         
         due_date_str = request.POST.get('due_date')
         if due_date_str:
             try:
-                task.due_date = timezone.make_aware(
+                fields['due_date'] = timezone.make_aware(
                     datetime.strptime(due_date_str, "%Y-%m-%dT%H:%M")
                 )
             except ValueError:
                 pass
         else:
-            task.due_date = None
+            fields['due_date'] = None
         
-        task.save()
+        # Один UPDATE без предварительного SELECT
+        if not Task.objects.filter(id=pk).update(**fields):
+            raise Http404
         return redirect('task_list')
     
+    task = get_object_or_404(Task, id=pk)
     return render(request, 'tasks/task_form.html', {
         'task': task,
         'action': 'Редактировать',
@@ -73,25 +86,26 @@ def task_update(request, pk):
 
 def task_delete(request, pk):
     """Удаление задачи"""
-    task = get_object_or_404(Task, id=pk)
-    
     if request.method == 'POST':
-        task.delete()
+        deleted, _ = Task.objects.filter(id=pk).delete()
+        if not deleted:
+            raise Http404
         return redirect('task_list')
     
+    task = get_object_or_404(Task, id=pk)
     return render(request, 'tasks/task_confirm_delete.html', {'task': task})
 
 
 def task_toggle(request, pk):
     """Переключить статус"""
-    task = get_object_or_404(Task, id=pk)
-    
-    if task.status == 'new':
-        task.status = 'in_progress'
-    elif task.status == 'in_progress':
-        task.status = 'done'
-    else:
-        task.status = 'new'
-    
-    task.save()
+    # new -> in_progress -> done -> new (просроченная тоже возвращается в new), одним UPDATE
+    updated = Task.objects.filter(id=pk).update(
+        status=Case(
+            When(status='new', then=Value('in_progress')),
+            When(status='in_progress', then=Value('done')),
+            default=Value('new'),
+        )
+    )
+    if not updated:
+        raise Http404
     return redirect('task_list')
\ No newline at end of file